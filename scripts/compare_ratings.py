@@ -4,6 +4,7 @@ import json
 import re
 import sys
 import time
+from typing import Iterator, TextIO
 
 import requests
 
@@ -11,6 +12,8 @@ START_TIME = time.time()
 H_RANKS = "data/howland_ratings.csv"
 POP_RANKS = "data/popular_ratings.csv"
 COMP_RANKS = "data/compared_ratings.csv"
+STREAM_BATCH_SIZE = 1000  # Rows buffered before each write & flush in streaming mode
+STREAM_PROGRESS_INTERVAL = 10_000  # Rows between status updates in streaming mode, since we don't know the total up front
 
 # Color constants
 RED = "\033[0;31m"
@@ -88,10 +91,82 @@ def main():
     sys.exit(0)
 
 
+def stream_howland_ratings() -> Iterator[tuple[str, int]]:
+    """Yield (name, rating) pairs from Howland's ratings one row at a time."""
+    with open(H_RANKS, "r", encoding="utf-8") as howland_ratings_file:
+        reader = csv.reader(howland_ratings_file)
+        next(reader)  # Skip header row
+        for name, rating, _ in reader:
+            yield name, int(re.sub("/10", "", rating))
+
+
+def stream_popular_ratings() -> Iterator[tuple[str, float, int]]:
+    """Yield (name, rating, TMDB ID) tuples from the popular ratings one row at a time."""
+    with open(POP_RANKS, "r", encoding="utf-8") as popular_ratings_file:
+        reader = csv.reader(popular_ratings_file)
+        next(reader)  # Skip header row
+        for name, rating, tmdb_id in reader:
+            yield name, float(rating), int(tmdb_id)
+
+
+def stream_joined_ratings() -> Iterator[tuple[str, float, int, int]]:
+    """Join the popular ratings to Howland's ratings without loading either file into memory.
+    tmdb_ratings.py writes the popular ratings in the same order as Howland's ratings (it only skips movies it couldn't find),
+    so we can walk both files side by side and skip ahead in Howland's ratings until the names line up.
+
+    Yields:
+        tuple[str, float, int, int]: The movie name, popular rating, Howland rating, and TMDB ID.
+    """
+    howland_ratings = stream_howland_ratings()
+    for name, pop_rating, tmdb_id in stream_popular_ratings():
+        for howland_name, howland_rating in howland_ratings:
+            if howland_name == name:
+                break
+        else:
+            # either the movie is missing or the files are out of order, both of which mean the data needs regenerating
+            print(f"{RED}No rating found for {name} in Howland's ratings (are both files in the same order?){NC}")
+            sys.exit(1)
+        yield name, pop_rating, howland_rating, tmdb_id
+
+
+def flush_rows(file: TextIO, writer, batch: list) -> None:
+    """Write a batch of rows, empty the batch, and flush the file so buffered rows don't pile up in memory."""
+    writer.writerows(batch)
+    batch.clear()
+    file.flush()
+
+
+def stream_main():
+    """Streaming version of main() for very large rating catalogs. Ratings are joined and written in batches, so memory use stays flat
+    no matter how many movies there are.
+    """
+    processed = 0
+    batch = []
+
+    with open(COMP_RANKS, "w", newline="", encoding="utf-8") as compared_ratings:
+        writer = csv.writer(compared_ratings)
+        writer.writerow(["Title", "Popular Rating", "Howland Rating", "Genres"])  # write the header row
+
+        for processed, (name, pop_rating, howland_rating, tmdb_id) in enumerate(stream_joined_ratings(), start=1):
+            title, genres = query_movie_title_and_name(tmdb_id)
+            batch.append([title, pop_rating, howland_rating, "; ".join(genres)])
+            if len(batch) >= STREAM_BATCH_SIZE:
+                flush_rows(compared_ratings, writer, batch)
+
+            if processed % STREAM_PROGRESS_INTERVAL == 0:
+                print(f"{LIGHTGREEN}Processed {processed} movies ({time.time() - START_TIME:.2f}s){NC}")
+
+        flush_rows(compared_ratings, writer, batch)
+
+    print(f"{GREEN}Completed processing all {processed} movies ({time.time() - START_TIME:.2f}s){NC}")
+    sys.exit(0)
+
+
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Fetch movie ratings from The Movie Database API")
     parser.add_argument("--tmdb_token", type=str, help="API token for The Movie Database API")
+    parser.add_argument("--stream", action="store_true", help="Process ratings in constant memory. Use for very large rating catalogs.")
     args = parser.parse_args()
 
     if args.tmdb_token:
@@ -106,4 +181,7 @@ if __name__ == "__main__":
             print(f"{RED}API key not provided and config.json file not found or invalid{NC}")
             sys.exit(1)
 
-    main()
+    if args.stream:
+        stream_main()
+    else:
+        main()
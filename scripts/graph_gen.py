@@ -1,6 +1,7 @@
 import argparse
 import csv
 import time
+from array import array
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -8,6 +9,7 @@ import numpy as np
 START_TIME = time.time()
 COMP_RANKS = "data/compared_ratings.csv"
 GRAPH_OUTPUT = "data/compared_ratings.svg"
+STREAM_PROGRESS_INTERVAL = 100_000  # Rows between status updates in streaming mode, since we don't know the total up front
 
 # Color constants
 RED = "\033[0;31m"
@@ -25,16 +27,70 @@ def get_compared_ratings() -> list[tuple[str, int, int, list[str]]]:
         reader = csv.reader(compared_ratings_file)
         next(reader)  # Skip header row
         for row in reader:
-            title, p_rat, h_rat, genres = row
-            compared_ratings.append((title, float(p_rat), int(h_rat), [genre.strip() for genre in genres.split(";")]))
+            compared_ratings.append(parse_compared_row(row))
+    print(f"{CYAN}Successfully retrieved compared ratings ({time.time() - START_TIME:.2f}s){NC}")
+    return compared_ratings
+
+
+class StreamedRatings:
+    """Compact, array-backed stand-in for the list returned by get_compared_ratings(), for very large rating catalogs.
+    Only the two ratings and the file offset of each row are kept in memory. Titles and genres are read back from the file
+    when a row is indexed, which only happens when hovering over a point on the graph.
+    """
+
+    __slots__ = ("path", "popular", "howland", "offsets")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.popular = array("f")
+        self.howland = array("h")
+        self.offsets = array("q")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> tuple[str, float, int, list[str]]:
+        with open(self.path, "rb") as compared_ratings_file:
+            compared_ratings_file.seek(self.offsets[index])
+            line = compared_ratings_file.readline().decode("utf-8")
+        return parse_compared_row(next(csv.reader([line])))
+
+
+def parse_compared_row(row: list[str]) -> tuple[str, float, int, list[str]]:
+    title, p_rat, h_rat, genres = row
+    return title, float(p_rat), int(h_rat), [genre.strip() for genre in genres.split(";")]
+
+
+def stream_compared_ratings() -> StreamedRatings:
+    """Read the compared ratings one row at a time into a StreamedRatings, so memory use stays small & flat per row.
+    Rows are read line by line (in binary mode so offsets can be seeked to later), as titles and genres never contain newlines.
+    """
+    compared_ratings = StreamedRatings(COMP_RANKS)
+    with open(COMP_RANKS, "rb") as compared_ratings_file:
+        compared_ratings_file.readline()  # Skip header row
+        offset = compared_ratings_file.tell()
+        for processed, line in enumerate(iter(compared_ratings_file.readline, b""), start=1):
+            _, p_rat, h_rat, _ = next(csv.reader([line.decode("utf-8")]))
+            compared_ratings.popular.append(float(p_rat))
+            compared_ratings.howland.append(int(h_rat))
+            compared_ratings.offsets.append(offset)
+            offset += len(line)
+
+            if processed % STREAM_PROGRESS_INTERVAL == 0:
+                print(f"{LIGHTGREEN}Read {processed} compared ratings ({time.time() - START_TIME:.2f}s){NC}")
     print(f"{CYAN}Successfully retrieved compared ratings ({time.time() - START_TIME:.2f}s){NC}")
     return compared_ratings
 
 
 def make_graph(compared_ratings):
     # Extract x axis (Howland's ratings) and y axis (popular ratings) values from the data
-    x = [movie[2] for movie in compared_ratings]
-    y = [movie[1] for movie in compared_ratings]
+    if isinstance(compared_ratings, StreamedRatings):
+        # wrap the arrays without copying them
+        x = np.frombuffer(compared_ratings.howland, dtype=np.int16)
+        y = np.frombuffer(compared_ratings.popular, dtype=np.float32)
+    else:
+        x = [movie[2] for movie in compared_ratings]
+        y = [movie[1] for movie in compared_ratings]
 
     # Create a scatter plot
     fig, ax = plt.subplots()
@@ -87,9 +143,10 @@ if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Create a graph comparing movie ratings")
     parser.add_argument("--noshow", action="store_true", help="Prevent showing the graph after saving. Graph is only interactive when shown.")
+    parser.add_argument("--stream", action="store_true", help="Read ratings into compact arrays instead of lists. Use for very large rating catalogs.")
     args = parser.parse_args()
 
-    comp_ratings = get_compared_ratings()
+    comp_ratings = stream_compared_ratings() if args.stream else get_compared_ratings()
     make_graph(comp_ratings)
 
     plt.savefig(GRAPH_OUTPUT, dpi=300, bbox_inches="tight")
@@ -4,12 +4,15 @@ import json
 import re
 import sys
 import time
+from typing import Iterator, TextIO
 
 import requests
 
 START_TIME = time.time()
 H_RANKS = "data/howland_ratings.csv"
 POP_RANKS = "data/popular_ratings.csv"
+STREAM_BATCH_SIZE = 1000  # Rows buffered before each write & flush in streaming mode
+STREAM_PROGRESS_INTERVAL = 10_000  # Rows between status updates in streaming mode, since we don't know the total up front
 
 # Color constants
 RED = "\033[0;31m"
@@ -199,10 +202,68 @@ def main():
     sys.exit(0)
 
 
+def stream_howland_rows() -> Iterator[list[str]]:
+    """Yield the rows of Howland's ratings one at a time, skipping the header row."""
+    with open(H_RANKS, "r", encoding="utf-8") as howland_ratings:
+        reader = csv.reader(howland_ratings)
+        next(reader)  # Skip the header row
+        yield from reader
+
+
+def flush_rows(file: TextIO, writer, batch: list) -> None:
+    """Write a batch of rows, empty the batch, and flush the file so buffered rows don't pile up in memory."""
+    writer.writerows(batch)
+    batch.clear()
+    file.flush()
+
+
+def stream_main():
+    """Streaming version of main() for very large rating catalogs. Rows are read and written in batches, so memory use stays flat
+    no matter how many movies there are. Since the total isn't known up front, the 10% failure limit is checked against the running count.
+    """
+    processed = 0
+    failed_fetches = 0
+    batch = []
+
+    with open(POP_RANKS, "w", newline="", encoding="utf-8") as popular_ratings:
+        writer = csv.writer(popular_ratings)
+        writer.writerow(["Name", "Rating", "TMDB ID"])
+
+        for processed, row in enumerate(stream_howland_rows(), start=1):
+            movie_name = row[0]
+            notes = row[2] if len(row) > 2 else ""
+            rating, id = get_tmdb_rating(movie_name, notes)
+
+            if rating is not None:
+                batch.append([movie_name, rating, id])
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    flush_rows(popular_ratings, writer, batch)
+            else:
+                failed_fetches += 1
+                if processed >= STREAM_BATCH_SIZE and failed_fetches >= processed // 10:
+                    # only check the running failure rate once we've got a decent sample, otherwise one early miss would end the run
+                    print(f"{RED}Exceeded failure limit with {failed_fetches} failures out of {processed} movies, exiting...{NC}")
+                    sys.exit(1)
+
+            if processed % STREAM_PROGRESS_INTERVAL == 0:
+                print(f"{LIGHTGREEN}Processed {processed} movies ({time.time() - START_TIME:.2f}s){NC}")
+
+        flush_rows(popular_ratings, writer, batch)
+
+    if failed_fetches and failed_fetches >= processed // 10:
+        # final check for small catalogs that never reached the sample size above
+        print(f"{RED}Exceeded failure limit with {failed_fetches} failures out of {processed} movies, exiting...{NC}")
+        sys.exit(1)
+
+    print(f"{GREEN}Completed processing all {processed} movies ({time.time() - START_TIME:.2f}s){NC}")
+    sys.exit(0)
+
+
 if __name__ == "__main__":
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Fetch movie ratings from The Movie Database API")
     parser.add_argument("--tmdb_token", type=str, help="API token for The Movie Database API")
+    parser.add_argument("--stream", action="store_true", help="Process ratings in constant memory. Use for very large rating catalogs.")
     args = parser.parse_args()
 
     if args.tmdb_token:
@@ -217,4 +278,7 @@ if __name__ == "__main__":
             print(f"{RED}API key not provided and config.json file not found or invalid{NC}")
             sys.exit(1)
 
-    main()
+    if args.stream:
+        stream_main()
+    else:
+        main()